@@ -1,7 +1,19 @@
 
 import os
+import gc
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+import matplotlib
+matplotlib.use("Agg")  # figures are only saved to disk; no GUI backend per worker
 import matplotlib.pyplot as plt
 
 # -------------------------
@@ -12,14 +24,122 @@ WEATHER_PATH = "flights_weather2022.csv"
 OUTDIR = "flight_analysis_outputs"
 os.makedirs(OUTDIR, exist_ok=True)
 
+# CSV reader: "pyarrow" (default, multi-threaded) or "polars" (if installed)
+CSV_ENGINE = "pyarrow"
+# Narrow dtypes for columns we know up front (matched case-insensitively)
+CSV_COLUMN_TYPES = {
+    "YEAR": "int16",
+    "MONTH": "int8",
+    "DAY": "int8",
+    "DEP_DELAY": "float32",
+    "CANCELLED": "float32",  # BTS files store flags as 1.00/0.00
+}
+# Weather fields joined onto flights (substring match on column names);
+# set to None to join every numeric weather column as before
+WX_KEEP = ("TEMP", "TMAX", "TMIN", "DEWP", "HUMID", "PRCP", "PRECIP", "SNOW",
+           "WIND", "AWND", "PRESSURE", "VISIB")
+# Run load -> prep -> merge as one polars lazy plan when polars is installed
+USE_POLARS_LAZY = True
+# Worker processes used to render the figures (1 = render serially)
+PLOT_WORKERS = 5
+# Cache each parsed CSV as Parquet next to it (e.g. flights2022.parquet)
+USE_PARQUET_CACHE = True
+# Column-name patterns, built once and reused by the prep/plot lookups below
+DATE_PARTS = frozenset(("YEAR", "MONTH", "DAY"))
+TEMP_TOKENS = ("TEMP", "TMAX", "TMIN")  # "TEMPERATURE" is covered by "TEMP"
+# Text date layouts the polars plan parses (ISO, and BTS-style "2/21/2022 12:00:00 AM");
+# a date column in any other layout is left to pandas' format inference
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S",
+                "%m/%d/%Y", "%m/%d/%Y %I:%M:%S %p", "%m/%d/%Y %H:%M")
+# HHMM time fields turned into datetimes on the flight date (common names)
+TIME_MAP = {
+    "CRS_DEP_TIME": "SCHED_DEP_DATETIME",
+    "DEP_TIME": "ACTUAL_DEP_DATETIME",
+    "CRS_ARR_TIME": "SCHED_ARR_DATETIME",
+    "ARR_TIME": "ACTUAL_ARR_DATETIME"
+}
+# Flight columns kept for the merge (when present)
+USEFUL_COLS = ["FL_DATE", "AIRLINE", "TAIL_NUM", "FL_NUM", "ORIGIN", "DEST", "DEP_DELAY_MIN", "ARR_DELAY",
+               "DISTANCE", "CANCELLED_FLAG", "SCHED_DEP_DATETIME", "ACTUAL_DEP_DATETIME"]
+# Low-cardinality code columns stored as pandas "category"
+CATEGORY_COLS = ("AIRLINE", "CARRIER", "OP_CARRIER", "ORIGIN", "DEST", "TAIL_NUM", "TAILNUM")
+
 # -------------------------
 # Utility functions
 # -------------------------
-def safe_read_csv(path):
+def optimize_dtypes(df):
+    """
+    Shrink a DataFrame in place and return it.
+    - integer columns are downcast to the smallest int type (unsigned stays unsigned), floats to float32.
+    - CATEGORY_COLS (matched case-insensitively) become pandas "category".
+    """
+    for c in df.columns:
+        if c.upper() in CATEGORY_COLS:
+            df[c] = df[c].astype("category")
+        elif pd.api.types.is_bool_dtype(df[c]):
+            continue
+        elif pd.api.types.is_unsigned_integer_dtype(df[c]):
+            df[c] = pd.to_numeric(df[c], downcast="unsigned")
+        elif pd.api.types.is_integer_dtype(df[c]):
+            df[c] = pd.to_numeric(df[c], downcast="integer")
+        elif pd.api.types.is_float_dtype(df[c]):
+            df[c] = pd.to_numeric(df[c], downcast="float")
+    return df
+
+def numeric_columns(df):
+    """Numeric, non-bool column names, as select_dtypes(include=[np.number]) but without building a frame."""
+    return [c for c, dt in df.dtypes.items()
+            if pd.api.types.is_numeric_dtype(dt) and not pd.api.types.is_bool_dtype(dt)]
+
+def fresh_parquet_cache(path):
+    """Path of the sibling .parquet cache of a CSV if it is at least as new as the CSV, else None."""
+    pq_path = os.path.splitext(path)[0] + ".parquet"
+    if os.path.exists(pq_path) and os.path.getmtime(pq_path) >= os.path.getmtime(path):
+        return pq_path
+    return None
+
+def safe_read_csv(path, engine=CSV_ENGINE, arrow_dtypes=False, use_cache=USE_PARQUET_CACHE):
+    """
+    Load a CSV with a multi-threaded reader.
+    - engine="pyarrow" parses with pyarrow.csv; engine="polars" uses polars.read_csv.
+    - arrow_dtypes=True keeps Arrow-backed columns (pd.ArrowDtype) instead of NumPy ones;
+      note these propagate NA through comparisons, so the prep code below expects NumPy.
+    - use_cache=True reads a sibling .parquet file when it is at least as new as the CSV,
+      otherwise parses the CSV, shrinks its dtypes and writes that cache.
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(f"CSV not found: {path}")
-    df = pd.read_csv(path)
+    pq_path = fresh_parquet_cache(path) if use_cache and not arrow_dtypes else None
+    if pq_path:
+        df = pd.read_parquet(pq_path, engine="pyarrow")
+        print(f"Loaded {pq_path} (cache) -> shape: {df.shape}")
+        return df
+    if engine == "polars":
+        import polars as pl
+        df = pl.read_csv(path, null_values=["NA", ""], infer_schema_length=10000).to_pandas(use_pyarrow_extension_array=arrow_dtypes)
+    else:
+        column_types = {}
+        for name, typ in CSV_COLUMN_TYPES.items():
+            column_types[name] = typ
+            column_types[name.lower()] = typ
+        read_options = pacsv.ReadOptions(use_threads=True, block_size=16 << 20)
+        try:
+            tbl = pacsv.read_csv(path, read_options=read_options,
+                                 convert_options=pacsv.ConvertOptions(column_types=column_types))
+        except pa.ArrowInvalid as e:
+            # a pinned column doesn't fit its narrow type (e.g. "2022.0" as int16): let pyarrow infer
+            print(f"Typed read of {path} failed ({e}); re-reading with inferred types")
+            tbl = pacsv.read_csv(path, read_options=read_options)
+        df = tbl.to_pandas(types_mapper=pd.ArrowDtype if arrow_dtypes else None)
     print(f"Loaded {path} -> shape: {df.shape}")
+    if use_cache and not arrow_dtypes:
+        optimize_dtypes(df)
+        pq_path = os.path.splitext(path)[0] + ".parquet"
+        try:
+            df.to_parquet(pq_path, engine="pyarrow", compression="snappy")
+            print(f"Cached {path} -> {pq_path}")
+        except Exception as e:
+            print("Parquet cache write failed:", e)
     return df
 
 def hhmm_to_datetime(date_series, time_series):
@@ -30,252 +150,598 @@ def hhmm_to_datetime(date_series, time_series):
     """
     if time_series is None or date_series is None:
         return pd.Series(pd.NaT, index=date_series.index)
-    s = time_series.fillna(np.nan).astype(str).str.replace(r'\.0+$','', regex=True).str.zfill(4)
-    mask_valid = s.str.isdigit()
-    out = pd.Series(pd.NaT, index=date_series.index, dtype="datetime64[ns]")
-    try:
-        hh = s[mask_valid].str.slice(0,2).astype(int)
-        mm = s[mask_valid].str.slice(2,4).astype(int)
-        out_valid = pd.to_datetime(date_series[mask_valid].dt.date) + pd.to_timedelta(hh, unit="h") + pd.to_timedelta(mm, unit="m")
-        out.loc[mask_valid] = out_valid
-    except Exception:
-        # fallback: return NaT if anything fails
-        out[:] = pd.NaT
-    return out
+    # Pure integer arithmetic on int64 ns: HHMM -> hh*3600 + mm*60 seconds past midnight
+    t = pd.to_numeric(time_series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    base = date_series.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype("datetime64[ns]")
+    valid = ~np.isnan(t) & (t >= 0) & (t == np.floor(t)) & ~np.isnat(base)
+    tt = np.where(valid, t, 0).astype("int64")
+    offs = ((tt // 100) * 3600 + (tt % 100) * 60) * 1_000_000_000
+    out = (base.view("i8") + offs).view("datetime64[ns]")
+    out[~valid] = np.datetime64("NaT")
+    return pd.Series(out, index=date_series.index)
 
-# -------------------------
-# Load data
-# -------------------------
-flights_raw = safe_read_csv(FLIGHTS_PATH)
-weather_raw = safe_read_csv(WEATHER_PATH)
+def _daily_and_rolling(days, flags, window):
+    """Fused kernel: per-day flag sums over sorted int64 days, then a trailing-window mean."""
+    n = days.shape[0]
+    out_days = np.empty(n, np.int64)
+    counts = np.zeros(n, np.int64)
+    n_days = 0
+    for i in range(n):
+        if i == 0 or days[i] != days[i - 1]:
+            out_days[n_days] = days[i]
+            n_days += 1
+        counts[n_days - 1] += flags[i]
+    rolling = np.empty(n_days, np.float64)
+    acc = 0
+    for k in range(n_days):
+        acc += counts[k]
+        if k >= window:
+            acc -= counts[k - window]
+        rolling[k] = acc / min(k + 1, window)
+    return out_days[:n_days], counts[:n_days], rolling
 
-# Standardize column names to uppercase to make matching robust
-flights_raw.columns = [c.upper() for c in flights_raw.columns]
-weather_raw.columns = [c.upper() for c in weather_raw.columns]
+if njit is not None:
+    _daily_and_rolling = njit(cache=True)(_daily_and_rolling)
 
-# -------------------------
-# Prepare flights dataframe
-# -------------------------
-fl = flights_raw.copy()
-
-# If YEAR, MONTH, DAY exist, create FL_DATE
-if set(["YEAR","MONTH","DAY"]).issubset(fl.columns) and "FL_DATE" not in fl.columns:
-    fl["FL_DATE"] = pd.to_datetime(fl[["YEAR","MONTH","DAY"]], errors="coerce")
-elif "FL_DATE" in fl.columns:
-    fl["FL_DATE"] = pd.to_datetime(fl["FL_DATE"], errors="coerce")
-# If there's a time_hour or similar date-time column, convert
-if "TIME_HOUR" in fl.columns:
+def daily_cancellations(dates, flags, window=30):
+    """
+    Daily cancellation counts and their rolling mean (min_periods=1), as two Series by date.
+    - With numba installed both come out of one JIT-compiled scan; otherwise pandas groupby/rolling.
+    """
+    if njit is None:
+        daily = flags.groupby(dates).sum().sort_index()
+        return daily, daily.rolling(window=window, min_periods=1).mean()
+    days = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    valid = ~np.isnat(days)
+    days = days[valid].view("i8")
+    flag_vals = flags.to_numpy(dtype=np.uint8)[valid]
+    if days.size > 1 and (np.diff(days) < 0).any():
+        order = np.argsort(days, kind="stable")
+        days, flag_vals = days[order], flag_vals[order]
+    out_days, counts, rolling = _daily_and_rolling(days, flag_vals, window)
+    index = pd.DatetimeIndex(out_days.view("datetime64[D]").astype("datetime64[ns]"), name=dates.name)
+    return pd.Series(counts, index=index, name=flags.name), pd.Series(rolling, index=index)
+
+def mean_by_date(df, date_col, value_cols):
+    """
+    Per-date mean of value_cols, one row per date sorted by date.
+    - Uses polars when installed, else pandas' numba groupby engine, else plain pandas.
+    """
     try:
-        fl["TIME_HOUR"] = pd.to_datetime(fl["TIME_HOUR"], errors="coerce")
-    except Exception:
+        import polars as pl
+        agg = (
+            pl.from_pandas(df[[date_col] + value_cols])
+            .filter(pl.col(date_col).is_not_null())
+            .group_by(date_col)
+            .agg([pl.col(c).mean() for c in value_cols])
+            .sort(date_col)
+        )
+        return agg.to_pandas()
+    except ImportError:
         pass
+    # Sorted keys let groupby take its monotonic fast path
+    df = df[[date_col] + value_cols].sort_values(date_col, kind="stable")
+    grouped = df.groupby(date_col, sort=False, observed=True)[value_cols]
+    try:
+        agg = grouped.mean(engine="numba", engine_kwargs={"parallel": True, "nogil": True})
+    except ImportError:
+        agg = grouped.mean()
+    return agg.reset_index()
 
-# Create scheduled / actual datetimes when time fields exist (common names)
-time_map = {
-    "CRS_DEP_TIME": "SCHED_DEP_DATETIME",
-    "DEP_TIME": "ACTUAL_DEP_DATETIME",
-    "CRS_ARR_TIME": "SCHED_ARR_DATETIME",
-    "ARR_TIME": "ACTUAL_ARR_DATETIME"
-}
-for tcol, outcol in time_map.items():
-    if tcol in fl.columns and "FL_DATE" in fl.columns:
-        fl[outcol] = hhmm_to_datetime(fl["FL_DATE"], fl[tcol])
-
-# DEP_DELAY may already be minutes; if not, compute using datetimes
-if "DEP_DELAY" in fl.columns:
-    fl["DEP_DELAY_MIN"] = pd.to_numeric(fl["DEP_DELAY"], errors="coerce")
-else:
-    if "ACTUAL_DEP_DATETIME" in fl.columns and "SCHED_DEP_DATETIME" in fl.columns:
-        fl["DEP_DELAY_MIN"] = (fl["ACTUAL_DEP_DATETIME"] - fl["SCHED_DEP_DATETIME"]).dt.total_seconds() / 60
+def merge_on_date(left, right, left_on, right_on, validate=None):
+    """
+    Left-join right onto left by date, keeping both key columns and suffixing clashes with _WX.
+    - Joins in polars when installed (returned as NumPy-backed pandas), else with pd.merge
+      on date-sorted inputs so pandas can take its monotonic join path.
+    - Either way the rows come back in the left frame's original order.
+    """
+    if right[right_on].dtype != left[left_on].dtype:
+        # polars refuses to join datetime keys of different units (e.g. ms vs us)
+        right = right.assign(**{right_on: right[right_on].astype(left[left_on].dtype)})
+    try:
+        import polars as pl
+        joined = pl.from_pandas(left).join(
+            pl.from_pandas(right), left_on=left_on, right_on=right_on, how="left",
+            validate=validate or "m:m", suffix="_WX", coalesce=False, maintain_order="left",
+        )
+        return joined.to_pandas()
+    except ImportError:
+        pass
+    restore = not left[left_on].is_monotonic_increasing
+    if restore:
+        left = left.assign(_ROW=np.arange(len(left))).sort_values(left_on, kind="stable")
+    right = right.sort_values(right_on, kind="stable")
+    merged = pd.merge(left, right, left_on=left_on, right_on=right_on, how="left",
+                      validate=validate, sort=False, suffixes=("","_WX"))
+    if restore:
+        merged = merged.sort_values("_ROW", kind="stable").drop(columns="_ROW").reset_index(drop=True)
+    return merged
+
+def build_merged_polars(flights_path, weather_path):
+    """
+    The load -> prep -> merge stages as one polars lazy plan, collected with the streaming engine.
+    - Mirrors build_merged_pandas (same derived columns, weather means and left join), while
+      polars pushes the column projection into the scans and runs the plan in parallel.
+    - Returns None (caller falls back to pandas) when polars is missing or the schema lacks
+      what the plan needs: a flight date and numeric, dated weather; or when a text date
+      column is not in one of DATE_FORMATS.
+    """
+    try:
+        import polars as pl
+    except ImportError:
+        return None
+    for path in (flights_path, weather_path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"CSV not found: {path}")
+
+    def scan(path):
+        if not USE_PARQUET_CACHE:
+            lf = pl.scan_csv(path, null_values=["NA", ""], infer_schema_length=10000)
+            return lf.rename(lambda c: c.upper())
+        pq_path = fresh_parquet_cache(path)
+        if pq_path is None:
+            # safe_read_csv owns the cache format (optimize_dtypes'd), so let it build the cache;
+            # if its write fails (it reports why), plan over the frame it already parsed
+            df = safe_read_csv(path)
+            pq_path = fresh_parquet_cache(path)
+            if pq_path is None:
+                return pl.from_pandas(df).lazy().rename(lambda c: c.upper())
+            del df
+        return pl.scan_parquet(pq_path).rename(lambda c: c.upper())
+
+    def date_expr(lf, schema, date_col):
+        if date_col in schema:
+            if schema[date_col] == pl.String:
+                parsed = pl.coalesce([pl.col(date_col).str.to_datetime(fmt, time_unit="us", strict=False)
+                                      for fmt in DATE_FORMATS])
+                # Unparsed text would silently become null dates; hand such files to pandas
+                if lf.select((pl.col(date_col).is_not_null() & parsed.is_null()).any()).collect().item():
+                    return None
+                return parsed
+            return pl.col(date_col).cast(pl.Datetime("us"), strict=False)
+        if DATE_PARTS.issubset(schema.names()):
+            # Via text so impossible dates (e.g. 2022-02-30) become null, like pandas' errors="coerce"
+            parts = [pl.col(c).cast(pl.Int64, strict=False).cast(pl.String) for c in ("YEAR", "MONTH", "DAY")]
+            return pl.concat_str(parts, separator="-").str.to_datetime("%Y-%m-%d", time_unit="us", strict=False)
+        return None
+
+    def hhmm_expr(time_col):
+        # Same rules as hhmm_to_datetime: offset from midnight of the flight date,
+        # non-negative whole HHMM values, 2400 rolls over
+        t = pl.col(time_col).cast(pl.Float64, strict=False)
+        ti = t.cast(pl.Int64, strict=False)
+        return (
+            pl.when(t.is_not_null() & (t >= 0) & (t == t.floor()))
+            .then(pl.col("FL_DATE").dt.truncate("1d") + pl.duration(hours=ti // 100, minutes=ti % 100))
+            .otherwise(None)
+            .cast(pl.Datetime("ns"))  # hhmm_to_datetime returns datetime64[ns]
+        )
+
+    # Flights
+    lf_fl = scan(flights_path)
+    fl_schema = lf_fl.collect_schema()
+    fl_cols = set(fl_schema.names())
+    fl_date = date_expr(lf_fl, fl_schema, "FL_DATE")
+    if fl_date is None:
+        return None
+    lf_fl = lf_fl.with_columns(fl_date.alias("FL_DATE"))
+    fl_cols.add("FL_DATE")
+    lf_fl = lf_fl.with_columns([hhmm_expr(tcol).alias(outcol) for tcol, outcol in TIME_MAP.items() if tcol in fl_cols])
+    fl_cols |= {outcol for tcol, outcol in TIME_MAP.items() if tcol in fl_cols}
+    if "DEP_DELAY" in fl_cols:
+        dep_delay = pl.col("DEP_DELAY").cast(pl.Float32, strict=False)
+    elif {"ACTUAL_DEP_DATETIME", "SCHED_DEP_DATETIME"}.issubset(fl_cols):
+        dep_delay = ((pl.col("ACTUAL_DEP_DATETIME") - pl.col("SCHED_DEP_DATETIME")).dt.total_milliseconds() / 60_000).cast(pl.Float32)
     else:
-        fl["DEP_DELAY_MIN"] = np.nan
-
-# Cancellation flag: prefer explicit column(s), otherwise infer
-cancel_col = None
-for c in fl.columns:
-    if "CANCEL" in c:
-        cancel_col = c
-        break
-if cancel_col:
-    fl["CANCELLED_FLAG"] = pd.to_numeric(fl[cancel_col], errors="coerce").fillna(0).astype(int)
-else:
-    # infer cancelled when both actual dep and arr are missing
-    act_dep = fl["ACTUAL_DEP_DATETIME"] if "ACTUAL_DEP_DATETIME" in fl.columns else pd.Series([pd.NaT]*len(fl))
-    act_arr = fl["ACTUAL_ARR_DATETIME"] if "ACTUAL_ARR_DATETIME" in fl.columns else pd.Series([pd.NaT]*len(fl))
-    fl["CANCELLED_FLAG"] = ((act_dep.isna()) & (act_arr.isna())).astype(int)
-
-# Use a common column name for the carrier/airline
-if "CARRIER" in fl.columns and "AIRLINE" not in fl.columns:
-    fl = fl.rename(columns={"CARRIER":"AIRLINE"})
-elif "OP_CARRIER" in fl.columns and "AIRLINE" not in fl.columns:
-    fl = fl.rename(columns={"OP_CARRIER":"AIRLINE"})
-
-# Keep a concise set for later use
-useful_cols = [c for c in ["FL_DATE", "AIRLINE", "TAIL_NUM", "FL_NUM", "ORIGIN", "DEST", "DEP_DELAY_MIN", "ARR_DELAY", "DISTANCE", "CANCELLED_FLAG", "SCHED_DEP_DATETIME", "ACTUAL_DEP_DATETIME"] if c in fl.columns]
-fl_small = fl[useful_cols].copy()
-print("Flights after prep -> shape:", fl_small.shape)
+        dep_delay = pl.lit(None, dtype=pl.Float32)
+    # first match in file column order, as in build_merged_pandas (CANCELLED before CANCELLATION_CODE)
+    cancel_col = next((c for c in fl_schema.names() if "CANCEL" in c), None)
+    if cancel_col:
+        cancelled = pl.col(cancel_col).cast(pl.Float64, strict=False).fill_null(0).cast(pl.UInt8)
+    else:
+        # infer cancelled when both actual dep and arr are missing
+        act_dep = pl.col("ACTUAL_DEP_DATETIME").is_null() if "ACTUAL_DEP_DATETIME" in fl_cols else pl.lit(True)
+        act_arr = pl.col("ACTUAL_ARR_DATETIME").is_null() if "ACTUAL_ARR_DATETIME" in fl_cols else pl.lit(True)
+        cancelled = (act_dep & act_arr).cast(pl.UInt8)
+    lf_fl = lf_fl.with_columns(dep_delay.alias("DEP_DELAY_MIN"), cancelled.alias("CANCELLED_FLAG"))
+    fl_cols |= {"DEP_DELAY_MIN", "CANCELLED_FLAG"}
+    if "AIRLINE" not in fl_cols:
+        carrier = next((c for c in ("CARRIER", "OP_CARRIER") if c in fl_cols), None)
+        if carrier:
+            lf_fl = lf_fl.rename({carrier: "AIRLINE"})
+            fl_cols.add("AIRLINE")
+    lf_fl = lf_fl.select([c for c in USEFUL_COLS if c in fl_cols])
 
-# -------------------------
-# Prepare weather dataframe
-# -------------------------
-wx = weather_raw.copy()
-# If weather has YEAR/MONTH/DAY but no DATE, create DATE
-if "DATE" not in wx.columns and set(["YEAR","MONTH","DAY"]).issubset(wx.columns):
-    wx["DATE"] = pd.to_datetime(wx[["YEAR","MONTH","DAY"]], errors="coerce")
-elif "DATE" in wx.columns:
-    wx["DATE"] = pd.to_datetime(wx["DATE"], errors="coerce")
-
-# If weather has station column matching ORIGIN, rename to ORIGIN
-if "STATION" in wx.columns and "ORIGIN" not in wx.columns:
-    # careful — only rename if likely the same code
-    wx = wx.rename(columns={"STATION":"ORIGIN"})
-
-# To keep merge efficient, aggregate numeric weather features per date (one row per DATE)
-numeric_weather_cols = wx.select_dtypes(include=[np.number]).columns.tolist()
-if len(numeric_weather_cols) > 0 and "DATE" in wx.columns:
-    wx_agg = wx.groupby("DATE")[numeric_weather_cols].mean().reset_index()
-    print("Aggregated weather rows (by date):", wx_agg.shape)
-else:
-    # if no numeric weather or no date, keep original but be careful merging
-    wx_agg = wx.copy()
-    print("No numeric weather/date found for aggregation; using raw weather for merge (may be many-to-many).")
+    # Weather: per-date means of the kept numeric fields
+    lf_wx = scan(weather_path)
+    wx_schema = lf_wx.collect_schema()
+    wx_date = date_expr(lf_wx, wx_schema, "DATE")
+    wx_numeric = [c for c, dt in wx_schema.items() if dt.is_numeric()]
+    wx_cols = wx_numeric
+    if WX_KEEP is not None:
+        wx_cols = [c for c in wx_cols if any(k in c for k in WX_KEEP)]
+    if wx_date is None or not wx_numeric:
+        return None
+    if wx_cols:
+        lf_wx = (
+            lf_wx.with_columns(wx_date.alias("DATE"))
+            .filter(pl.col("DATE").is_not_null())
+            .group_by("DATE")
+            .agg([pl.col(c).mean() for c in wx_cols])
+        )
+        lf_fl = lf_fl.join(
+            lf_wx, left_on="FL_DATE", right_on="DATE", how="left",
+            validate="m:1", suffix="_WX", coalesce=False, maintain_order="left",
+        )
+    else:
+        print("No numeric weather fields match WX_KEEP; proceeding with flights only.")
 
-# -------------------------
-# Merge flights + weather (date-level merge)
-# -------------------------
-if "FL_DATE" in fl_small.columns and "DATE" in wx_agg.columns:
-    merged = pd.merge(fl_small, wx_agg, left_on="FL_DATE", right_on="DATE", how="left", suffixes=("","_WX"))
-    print("Merged on FL_DATE==DATE -> shape:", merged.shape)
-else:
-    # fallback: no weather-date available; proceed with flights only
-    merged = fl_small.copy()
-    print("No weather DATE to merge on; proceeding with flights only.")
+    merged = lf_fl.collect(engine="streaming").to_pandas()
+    optimize_dtypes(merged)
+    print("Merged flights + weather (polars lazy plan) -> shape:", merged.shape)
+    return merged
 
 # -------------------------
-# Add derived columns
+# Load, prepare and merge
 # -------------------------
-m = merged.copy()
-# Ensure FL_DATE datetime
-if "FL_DATE" in m.columns:
-    m["FL_DATE"] = pd.to_datetime(m["FL_DATE"], errors="coerce")
-m["YEAR_MONTH"] = m["FL_DATE"].dt.to_period("M")
-m["DEP_DELAY_MIN"] = pd.to_numeric(m["DEP_DELAY_MIN"], errors="coerce")
-m["LONG_DELAY_FLAG"] = (m["DEP_DELAY_MIN"] > 15).astype(int)
-
-# Save a cleaned merged CSV
-cleaned_csv_path = os.path.join(OUTDIR, "cleaned_flights_merged.csv")
-m.to_csv(cleaned_csv_path, index=False)
-print("Saved cleaned merged CSV to:", cleaned_csv_path)
+def build_merged_pandas(flights_path, weather_path):
+    """
+    The pandas version of the load -> prep -> merge stages.
+    - Returns one row per flight with its date-level weather means joined on.
+    """
+    # -------------------------
+    # Load data
+    # -------------------------
+    flights_raw = safe_read_csv(flights_path)
+    weather_raw = safe_read_csv(weather_path)
+
+    # Standardize column names to uppercase to make matching robust
+    flights_raw.columns = [c.upper() for c in flights_raw.columns]
+    weather_raw.columns = [c.upper() for c in weather_raw.columns]
+
+    # Downcast numerics and categoricalize carrier/airport codes (no-op for Parquet-cached frames)
+    optimize_dtypes(flights_raw)
+    optimize_dtypes(weather_raw)
+
+    # -------------------------
+    # Prepare flights dataframe
+    # -------------------------
+    # Work on the loaded frame directly; every step below only adds/renames columns
+    fl = flights_raw
+    del flights_raw
+
+    # If YEAR, MONTH, DAY exist, create FL_DATE
+    if DATE_PARTS.issubset(fl.columns) and "FL_DATE" not in fl.columns:
+        fl["FL_DATE"] = pd.to_datetime(fl[["YEAR","MONTH","DAY"]], errors="coerce")
+    elif "FL_DATE" in fl.columns:
+        fl["FL_DATE"] = pd.to_datetime(fl["FL_DATE"], errors="coerce")
+    # If there's a time_hour or similar date-time column, convert
+    if "TIME_HOUR" in fl.columns:
+        try:
+            fl["TIME_HOUR"] = pd.to_datetime(fl["TIME_HOUR"], errors="coerce")
+        except Exception:
+            pass
+
+    # Create scheduled / actual datetimes when time fields exist (common names)
+    for tcol, outcol in TIME_MAP.items():
+        if tcol in fl.columns and "FL_DATE" in fl.columns:
+            fl[outcol] = hhmm_to_datetime(fl["FL_DATE"], fl[tcol])
+
+    # DEP_DELAY may already be minutes; if not, compute using datetimes
+    if "DEP_DELAY" in fl.columns:
+        fl["DEP_DELAY_MIN"] = pd.to_numeric(fl["DEP_DELAY"], errors="coerce")
+    else:
+        if "ACTUAL_DEP_DATETIME" in fl.columns and "SCHED_DEP_DATETIME" in fl.columns:
+            # Subtract the int64 ns views directly instead of materializing a timedelta Series
+            act = fl["ACTUAL_DEP_DATETIME"].to_numpy(dtype="datetime64[ns]")
+            sched = fl["SCHED_DEP_DATETIME"].to_numpy(dtype="datetime64[ns]")
+            mask = ~(np.isnat(act) | np.isnat(sched))
+            delay = np.full(len(fl), np.nan, dtype=np.float32)
+            delay[mask] = (act.view("i8")[mask] - sched.view("i8")[mask]) / 60_000_000_000
+            fl["DEP_DELAY_MIN"] = delay
+        else:
+            fl["DEP_DELAY_MIN"] = np.nan
+
+    # Cancellation flag: prefer explicit column(s), otherwise infer
+    cancel_col = next((c for c in fl.columns if "CANCEL" in c), None)
+    if cancel_col:
+        fl["CANCELLED_FLAG"] = pd.to_numeric(fl[cancel_col], errors="coerce").fillna(0).astype("uint8")
+    else:
+        # infer cancelled when both actual dep and arr are missing
+        act_dep = fl["ACTUAL_DEP_DATETIME"] if "ACTUAL_DEP_DATETIME" in fl.columns else pd.Series([pd.NaT]*len(fl))
+        act_arr = fl["ACTUAL_ARR_DATETIME"] if "ACTUAL_ARR_DATETIME" in fl.columns else pd.Series([pd.NaT]*len(fl))
+        fl["CANCELLED_FLAG"] = ((act_dep.isna()) & (act_arr.isna())).astype("uint8")
+
+    # Use a common column name for the carrier/airline
+    if "CARRIER" in fl.columns and "AIRLINE" not in fl.columns:
+        fl.rename(columns={"CARRIER":"AIRLINE"}, inplace=True)
+    elif "OP_CARRIER" in fl.columns and "AIRLINE" not in fl.columns:
+        fl.rename(columns={"OP_CARRIER":"AIRLINE"}, inplace=True)
+
+    # Keep a concise set for later use
+    useful_cols = [c for c in USEFUL_COLS if c in fl.columns]
+    # Column selection already materializes a new frame; drop the wide one before mutating it
+    fl_small = fl[useful_cols]
+    del fl
+    optimize_dtypes(fl_small)
+    print("Flights after prep -> shape:", fl_small.shape)
+
+    # -------------------------
+    # Prepare weather dataframe
+    # -------------------------
+    wx = weather_raw
+    del weather_raw
+    # If weather has YEAR/MONTH/DAY but no DATE, create DATE
+    if "DATE" not in wx.columns and DATE_PARTS.issubset(wx.columns):
+        wx["DATE"] = pd.to_datetime(wx[["YEAR","MONTH","DAY"]], errors="coerce")
+    elif "DATE" in wx.columns:
+        wx["DATE"] = pd.to_datetime(wx["DATE"], errors="coerce")
+
+    # If weather has station column matching ORIGIN, rename to ORIGIN
+    if "STATION" in wx.columns and "ORIGIN" not in wx.columns:
+        # careful — only rename if likely the same code
+        wx.rename(columns={"STATION":"ORIGIN"}, inplace=True)
+
+    # To keep merge efficient, aggregate numeric weather features per date (one row per DATE)
+    numeric_weather_cols = numeric_columns(wx)
+    # Only carry the weather fields the analysis uses into the (flight-sized) merged frame
+    kept_weather_cols = numeric_weather_cols
+    if WX_KEEP is not None:
+        kept_weather_cols = [c for c in numeric_weather_cols if any(k in c for k in WX_KEEP)]
+    if len(kept_weather_cols) > 0 and "DATE" in wx.columns:
+        wx_agg = mean_by_date(wx, "DATE", kept_weather_cols)
+        wx_is_daily = True
+        print("Aggregated weather rows (by date):", wx_agg.shape)
+    elif len(numeric_weather_cols) > 0:
+        # numeric weather exists but WX_KEEP drops all of it: nothing to join
+        wx_agg = None
+        print("No numeric weather fields match WX_KEEP; proceeding with flights only.")
+    else:
+        # if no numeric weather or no date, keep original but be careful merging
+        wx_agg = wx
+        wx_is_daily = False
+        print("No numeric weather/date found for aggregation; using raw weather for merge (may be many-to-many).")
+
+    # -------------------------
+    # Merge flights + weather (date-level merge)
+    # -------------------------
+    if wx_agg is None:
+        merged = fl_small
+    elif "FL_DATE" in fl_small.columns and "DATE" in wx_agg.columns:
+        # daily weather is one row per date, so validate the many-to-one shape as well
+        merged = merge_on_date(fl_small, wx_agg, "FL_DATE", "DATE", validate="m:1" if wx_is_daily else None)
+        print("Merged on FL_DATE==DATE -> shape:", merged.shape)
+    else:
+        # fallback: no weather-date available; proceed with flights only
+        merged = fl_small
+        print("No weather DATE to merge on; proceeding with flights only.")
+    return merged
 
 # -------------------------
 # Visualizations (matplotlib)
 # -------------------------
-# Helper to save figures
+# Each plot is a function of small, pre-aggregated inputs so the five figures can be
+# rendered in worker processes; the main process only prints what they report back.
 def savefig(fig, fname):
     path = os.path.join(OUTDIR, fname)
     fig.savefig(path, bbox_inches="tight")
-    print("Saved:", path)
+    return path
 
-# 1) Monthly average departure delay time-series
-try:
-    monthly = m.groupby("YEAR_MONTH")["DEP_DELAY_MIN"].mean().dropna()
-    monthly.index = monthly.index.to_timestamp()
+def plot_monthly(monthly, fname):
     fig = plt.figure(figsize=(10,5))
     plt.plot(monthly.index, monthly.values)
     plt.title("Monthly Average Departure Delay (minutes)")
     plt.xlabel("Month")
     plt.ylabel("Average Departure Delay (min)")
     plt.grid(True)
-    savefig(fig, "monthly_avg_dep_delay.png")
+    path = savefig(fig, fname)
     plt.close(fig)
-except Exception as e:
-    print("Monthly plot failed:", e)
+    return path
 
-# 2) Daily cancellations with 30-day rolling mean
-try:
-    if "CANCELLED_FLAG" in m.columns:
-        daily_cancel = m.groupby("FL_DATE")["CANCELLED_FLAG"].sum().sort_index()
-        rolling = daily_cancel.rolling(window=30, min_periods=1).mean()
-        fig = plt.figure(figsize=(12,5))
-        plt.plot(daily_cancel.index, daily_cancel.values, label="Daily cancellations (count)")
-        plt.plot(rolling.index, rolling.values, label="30-day rolling mean")
-        plt.title("Daily Cancellations with 30-day Rolling Mean")
-        plt.xlabel("Date")
-        plt.ylabel("Cancellations (count)")
-        plt.legend()
-        plt.grid(True)
-        savefig(fig, "daily_cancellations_rolling.png")
-        plt.close(fig)
-except Exception as e:
-    print("Cancellations plot failed:", e)
-
-# 3) Airline-wise average departure delay (top 15)
-try:
-    if "AIRLINE" in m.columns:
-        airline_delay = m.groupby("AIRLINE")["DEP_DELAY_MIN"].mean().dropna().sort_values(ascending=False)
-        top15 = airline_delay.head(15)
-        fig = plt.figure(figsize=(10,6))
-        plt.barh(top15.index[::-1], top15.values[::-1])
-        plt.title("Top 15 Airlines by Average Departure Delay (min)")
-        plt.xlabel("Average Dep Delay (min)")
-        plt.tight_layout()
-        savefig(fig, "airline_avg_dep_delay_top15.png")
-        plt.close(fig)
-except Exception as e:
-    print("Airline plot failed:", e)
-
-# 4) Correlation heatmap for numeric features (subset)
-try:
-    numeric_cols = m.select_dtypes(include=[np.number]).columns.tolist()
-    if len(numeric_cols) > 1:
-        subset = numeric_cols[:20]  # limit to 20 for readability
-        corr = m[subset].corr()
-        fig = plt.figure(figsize=(10,8))
-        plt.imshow(corr, interpolation='nearest', aspect='auto')
-        plt.colorbar()
-        plt.xticks(range(len(subset)), subset, rotation=90)
-        plt.yticks(range(len(subset)), subset)
-        plt.title("Correlation matrix (numeric features)")
-        plt.tight_layout()
-        savefig(fig, "correlation_heatmap.png")
-        plt.close(fig)
-except Exception as e:
-    print("Heatmap failed:", e)
-
-# 5) Scatter: departure delay vs temperature-like field (if present)
-temp_candidates = [c for c in m.columns if "TEMP" in c or "TEMPERATURE" in c or "TMAX" in c or "TMIN" in c]
-if len(temp_candidates) > 0:
-    tcol = temp_candidates[0]
+def plot_daily_cancellations(daily_cancel, rolling, fname):
+    fig = plt.figure(figsize=(12,5))
+    plt.plot(daily_cancel.index, daily_cancel.values, label="Daily cancellations (count)")
+    plt.plot(rolling.index, rolling.values, label="30-day rolling mean")
+    plt.title("Daily Cancellations with 30-day Rolling Mean")
+    plt.xlabel("Date")
+    plt.ylabel("Cancellations (count)")
+    plt.legend()
+    plt.grid(True)
+    path = savefig(fig, fname)
+    plt.close(fig)
+    return path
+
+def plot_airline_delay(top15, fname):
+    fig = plt.figure(figsize=(10,6))
+    plt.barh(top15.index[::-1], top15.values[::-1])
+    plt.title("Top 15 Airlines by Average Departure Delay (min)")
+    plt.xlabel("Average Dep Delay (min)")
+    plt.tight_layout()
+    path = savefig(fig, fname)
+    plt.close(fig)
+    return path
+
+def plot_corr_heatmap(corr, subset, fname):
+    fig = plt.figure(figsize=(10,8))
+    plt.imshow(corr, interpolation='nearest', aspect='auto')
+    plt.colorbar()
+    plt.xticks(range(len(subset)), subset, rotation=90)
+    plt.yticks(range(len(subset)), subset)
+    plt.title("Correlation matrix (numeric features)")
+    plt.tight_layout()
+    path = savefig(fig, fname)
+    plt.close(fig)
+    return path
+
+def plot_delay_scatter(sample_t, sample_d, tcol, fname):
+    fig = plt.figure(figsize=(8,6))
+    plt.scatter(sample_t, sample_d, alpha=0.4, s=8)
+    plt.xlabel(tcol)
+    plt.ylabel("Departure Delay (min)")
+    plt.title(f"Departure Delay vs {tcol}")
+    plt.tight_layout()
+    path = savefig(fig, fname)
+    plt.close(fig)
+    return path
+
+def run_plot_job(job):
+    """Render one (failure label, plot function, args) job and return the line to print."""
+    label, plot_fn, args = job
     try:
-        sample = m[[tcol, "DEP_DELAY_MIN"]].dropna()
-        if len(sample) > 2000:
-            sample = sample.sample(2000, random_state=1)
-        fig = plt.figure(figsize=(8,6))
-        plt.scatter(sample[tcol], sample["DEP_DELAY_MIN"], alpha=0.4, s=8)
-        plt.xlabel(tcol)
-        plt.ylabel("Departure Delay (min)")
-        plt.title(f"Departure Delay vs {tcol}")
-        plt.tight_layout()
-        savefig(fig, f"dep_delay_vs_{tcol}.png")
-        plt.close(fig)
+        return f"Saved: {plot_fn(*args)}"
     except Exception as e:
-        print("Scatter plot failed:", e)
-else:
-    print("No temperature-like column found. Skipping dep delay vs temp scatter.")
+        return f"{label}: {e}"
 
 # -------------------------
-# Summary prints
+# Main flow
 # -------------------------
-print("\nSummary stats:")
-print("Merged rows:", len(m))
-if "DEP_DELAY_MIN" in m.columns:
-    print("Mean departure delay (min):", round(m["DEP_DELAY_MIN"].mean(skipna=True),2))
-    print("Median departure delay (min):", round(m["DEP_DELAY_MIN"].median(skipna=True),2))
-    if "LONG_DELAY_FLAG" in m.columns:
-        print("Percent long delays (>15 min):", round(100*m["LONG_DELAY_FLAG"].mean(),2))
-if "CANCELLED_FLAG" in m.columns:
-    print("Total cancellations recorded:", int(m["CANCELLED_FLAG"].sum()))
-
-print("\nOutput files saved to:", os.path.abspath(OUTDIR))
-for fname in sorted(os.listdir(OUTDIR)):
-    print("-", fname)
+def main():
+    """Load, merge and save the cleaned data, then render the figures and print the summary."""
+    merged = build_merged_polars(FLIGHTS_PATH, WEATHER_PATH) if USE_POLARS_LAZY else None
+    if merged is None:
+        merged = build_merged_pandas(FLIGHTS_PATH, WEATHER_PATH)
+
+    # -------------------------
+    # Add derived columns
+    # -------------------------
+    m = merged
+    del merged
+    # Numeric columns of the merged frame, listed once and reused by the heatmap
+    numeric_cols = numeric_columns(m)
+    # Ensure FL_DATE datetime
+    if "FL_DATE" in m.columns:
+        m["FL_DATE"] = pd.to_datetime(m["FL_DATE"], errors="coerce")
+    # Integer month buckets (datetime64[M]) instead of a Period object per row;
+    # YEAR_MONTH is kept for the CSV as a "YYYY-MM" category built from the unique months
+    months = m["FL_DATE"].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+    month_codes, month_uniques = pd.factorize(months)
+    m["YEAR_MONTH"] = pd.Categorical.from_codes(month_codes, pd.DatetimeIndex(month_uniques).strftime("%Y-%m"))
+    m["DEP_DELAY_MIN"] = pd.to_numeric(m["DEP_DELAY_MIN"], errors="coerce")
+    m["LONG_DELAY_FLAG"] = m["DEP_DELAY_MIN"].to_numpy() > 15  # bool: 1 byte/row, mean() is still the share
+
+    # Save the cleaned merged data: Parquet is the primary artifact (Power BI reads it natively),
+    # the CSV is kept for other consumers; both go through pyarrow's multi-threaded C++ writers
+    cleaned_tbl = pa.Table.from_pandas(m, preserve_index=False)
+    cleaned_parquet_path = os.path.join(OUTDIR, "cleaned_flights_merged.parquet")
+    pq.write_table(cleaned_tbl, cleaned_parquet_path, compression="zstd")
+    print("Saved cleaned merged Parquet to:", cleaned_parquet_path)
+    cleaned_csv_path = os.path.join(OUTDIR, "cleaned_flights_merged.csv")
+    pacsv.write_csv(cleaned_tbl, cleaned_csv_path, write_options=pacsv.WriteOptions(include_header=True))
+    del cleaned_tbl
+    print("Saved cleaned merged CSV to:", cleaned_csv_path)
+
+    # Plots and summary need only a few columns each: release the merged frame and read
+    # those columns back from the memory-mapped Parquet output instead
+    merged_columns = m.columns.tolist()
+    merged_rows = len(m)
+    del m, months
+    gc.collect()
+
+    def load_cleaned(columns):
+        """Read just `columns` of the cleaned Parquet output into pandas."""
+        return pq.read_table(cleaned_parquet_path, columns=columns, memory_map=True).to_pandas()
+
+    plot_jobs = []
+
+    # 1) Monthly average departure delay time-series
+    try:
+        cols = load_cleaned(["FL_DATE", "DEP_DELAY_MIN"])
+        months = cols["FL_DATE"].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+        monthly = pd.Series(cols["DEP_DELAY_MIN"].to_numpy()).groupby(months).mean().dropna()
+        monthly.index = monthly.index.astype("datetime64[ns]")
+        plot_jobs.append(("Monthly plot failed", plot_monthly, (monthly, "monthly_avg_dep_delay.png")))
+    except Exception as e:
+        print("Monthly plot failed:", e)
+
+    # 2) Daily cancellations with 30-day rolling mean
+    try:
+        if "CANCELLED_FLAG" in merged_columns:
+            cols = load_cleaned(["FL_DATE", "CANCELLED_FLAG"])
+            daily_cancel, rolling = daily_cancellations(cols["FL_DATE"], cols["CANCELLED_FLAG"], window=30)
+            plot_jobs.append(("Cancellations plot failed", plot_daily_cancellations, (daily_cancel, rolling, "daily_cancellations_rolling.png")))
+    except Exception as e:
+        print("Cancellations plot failed:", e)
+
+    # 3) Airline-wise average departure delay (top 15)
+    try:
+        if "AIRLINE" in merged_columns:
+            cols = load_cleaned(["AIRLINE", "DEP_DELAY_MIN"])
+            airline_delay = cols.groupby("AIRLINE", observed=True)["DEP_DELAY_MIN"].mean().dropna().sort_values(ascending=False)
+            top15 = airline_delay.head(15)
+            plot_jobs.append(("Airline plot failed", plot_airline_delay, (top15, "airline_avg_dep_delay_top15.png")))
+    except Exception as e:
+        print("Airline plot failed:", e)
+
+    # 4) Correlation heatmap for numeric features (subset)
+    try:
+        if len(numeric_cols) > 1:
+            subset = numeric_cols[:20]  # limit to 20 for readability
+            # Display-only: one BLAS-backed np.corrcoef over a float32 matrix rather than pandas'
+            # per-pair NaN masking. Gaps are filled with the column mean, which leaves the
+            # gap-free columns' correlations exact and keeps sparse ones (e.g. delays) on the map.
+            arr = load_cleaned(subset).to_numpy(dtype=np.float32, na_value=np.nan)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                arr = np.where(np.isnan(arr), np.nanmean(arr, axis=0), arr)
+                corr = np.corrcoef(arr, rowvar=False)
+            plot_jobs.append(("Heatmap failed", plot_corr_heatmap, (corr, subset, "correlation_heatmap.png")))
+    except Exception as e:
+        print("Heatmap failed:", e)
+
+    # 5) Scatter: departure delay vs temperature-like field (if present)
+    temp_candidates = [c for c in merged_columns if any(tok in c for tok in TEMP_TOKENS)]
+    if len(temp_candidates) > 0:
+        tcol = temp_candidates[0]
+        try:
+            # Pick at most 2000 valid row positions first, then gather only those values
+            cols = load_cleaned([tcol, "DEP_DELAY_MIN"])
+            t_vals = cols[tcol].to_numpy()
+            d_vals = cols["DEP_DELAY_MIN"].to_numpy()
+            idx = np.flatnonzero(cols[tcol].notna().to_numpy() & cols["DEP_DELAY_MIN"].notna().to_numpy())
+            if idx.size > 2000:
+                idx = np.sort(np.random.default_rng(1).choice(idx, 2000, replace=False))
+            plot_jobs.append(("Scatter plot failed", plot_delay_scatter, (t_vals[idx], d_vals[idx], tcol, f"dep_delay_vs_{tcol}.png")))
+        except Exception as e:
+            print("Scatter plot failed:", e)
+    else:
+        print("No temperature-like column found. Skipping dep delay vs temp scatter.")
+
+    # Render the figures in parallel. Workers are spawned rather than forked: this process already
+    # runs pyarrow/polars/numba thread pools, and spawned workers import the plot functions above.
+    # Spawning costs a module import per worker, so stay serial without spare cores.
+    workers = min(PLOT_WORKERS, len(plot_jobs), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as ex:
+            plot_results = list(ex.map(run_plot_job, plot_jobs))
+    else:
+        plot_results = [run_plot_job(job) for job in plot_jobs]
+    for line in plot_results:
+        print(line)
+
+    # -------------------------
+    # Summary prints
+    # -------------------------
+    print("\nSummary stats:")
+    print("Merged rows:", merged_rows)
+    # One agg call so the summary columns are scanned together rather than once per statistic
+    summary_spec = {}
+    if "DEP_DELAY_MIN" in merged_columns:
+        summary_spec["DEP_DELAY_MIN"] = ["mean", "median"]
+        if "LONG_DELAY_FLAG" in merged_columns:
+            summary_spec["LONG_DELAY_FLAG"] = ["mean"]
+    if "CANCELLED_FLAG" in merged_columns:
+        summary_spec["CANCELLED_FLAG"] = ["sum"]
+    stats = load_cleaned(list(summary_spec)).agg(summary_spec) if summary_spec else pd.DataFrame()
+    if "DEP_DELAY_MIN" in stats.columns:
+        print("Mean departure delay (min):", round(float(stats.at["mean", "DEP_DELAY_MIN"]),2))
+        print("Median departure delay (min):", round(float(stats.at["median", "DEP_DELAY_MIN"]),2))
+        if "LONG_DELAY_FLAG" in stats.columns:
+            print("Percent long delays (>15 min):", round(100*float(stats.at["mean", "LONG_DELAY_FLAG"]),2))
+    if "CANCELLED_FLAG" in stats.columns:
+        print("Total cancellations recorded:", int(stats.at["sum", "CANCELLED_FLAG"]))
+
+    print("\nOutput files saved to:", os.path.abspath(OUTDIR))
+    for fname in sorted(os.listdir(OUTDIR)):
+        print("-", fname)
+
+if __name__ == "__main__":
+    main()